@@ -15,6 +15,7 @@ from hydrus.core import HydrusConstants as HC
 from hydrus.core import HydrusController
 from hydrus.core import HydrusData
 from hydrus.core import HydrusExceptions
+from hydrus.core import HydrusFileHandling
 from hydrus.core import HydrusGlobals as HG
 from hydrus.core import HydrusSerialisable
 from hydrus.core import HydrusTemp
@@ -44,6 +45,7 @@ from hydrus.client.gui import ClientGUIStyle
 from hydrus.client.gui import ClientGUITopLevelWindowsPanels
 from hydrus.client.gui import QtPorting as QP
 from hydrus.client.gui.lists import ClientGUIListManager
+from hydrus.client.importing import ClientImportFiles
 from hydrus.client.importing import ClientImportSubscriptions
 from hydrus.client.metadata import ClientTagsHandling
 from hydrus.client.networking import ClientNetworking
@@ -1152,6 +1154,9 @@ class Controller( HydrusController.HydrusController ):
         
         self.client_files_manager.Start()
         
+        # this takes a moment, so it goes off the main thread. hashing uses the default block size until it is done
+        self.CallToThread( HydrusFileHandling.InitialiseHashBlockSize )
+        
         self._managers[ 'undo' ] = ClientManagers.UndoManager( self )
         
         self.frame_splash_status.SetSubtext( 'image caches' )
@@ -1898,6 +1903,11 @@ class Controller( HydrusController.HydrusController ):
             
             self.file_viewing_stats_manager.Flush()
             
+            self.frame_splash_status.SetSubtext( 'file import archive flush' )
+            
+            # the timer that would normally send these off will not run once the schedulers stop
+            ClientImportFiles.FILE_IMPORT_ARCHIVE_BATCHER.Flush()
+            
             self.frame_splash_status.SetSubtext( '' )
             
             self.SaveDirtyObjectsImportant()
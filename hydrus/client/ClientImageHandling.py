@@ -1,4 +1,4 @@
-from functools import reduce
+import threading
 
 import numpy
 import numpy.core.multiarray # important this comes before cv!
@@ -18,6 +18,89 @@ cv_interpolation_enum_lookup[ CC.ZOOM_AREA ] = cv2.INTER_AREA
 cv_interpolation_enum_lookup[ CC.ZOOM_CUBIC ] = cv2.INTER_CUBIC
 cv_interpolation_enum_lookup[ CC.ZOOM_LANCZOS4 ] = cv2.INTER_LANCZOS4
 
+def ThresholdAndPackPerceptualHash( dct_64 ):
+    
+    # one pass over the dct, no temporary boolean array. the median of the 63 non-flat entries is exactly the middle one, so this matches numpy.median
+    
+    median = numpy.sort( dct_64[ 1: ] )[ 31 ]
+    
+    phash_row = numpy.zeros( 8, dtype = numpy.uint8 )
+    
+    for j in range( 64 ):
+        
+        if dct_64[ j ] > median:
+            
+            phash_row[ j // 8 ] |= 128 >> ( j % 8 )
+            
+        
+    
+    return phash_row
+    
+# numba takes a moment to import and its first compile can take a couple of seconds, so it is done on a worker thread the first time we make a phash
+# until it is ready, the phash goes through numpy
+NUMBA_OK = None
+THRESHOLD_AND_PACK_PERCEPTUAL_HASH_NUMBA = None
+
+numba_lock = threading.Lock()
+numba_initialisation_start_lock = threading.Lock()
+numba_initialisation_started = False
+
+def GetThresholdAndPackPerceptualHashNumba():
+    
+    global numba_initialisation_started
+    
+    if NUMBA_OK is None and not numba_initialisation_started:
+        
+        # not numba_lock, which the worker holds for the whole import and compile
+        with numba_initialisation_start_lock:
+            
+            if not numba_initialisation_started:
+                
+                numba_initialisation_started = True
+                
+                HG.client_controller.CallToThread( InitialiseNumba )
+                
+            
+        
+    
+    if NUMBA_OK:
+        
+        return THRESHOLD_AND_PACK_PERCEPTUAL_HASH_NUMBA
+        
+    
+    return None
+    
+def InitialiseNumba():
+    
+    global NUMBA_OK
+    global THRESHOLD_AND_PACK_PERCEPTUAL_HASH_NUMBA
+    
+    with numba_lock:
+        
+        if NUMBA_OK is None:
+            
+            try:
+                
+                import numba
+                
+                kernel = numba.njit( cache = True )( ThresholdAndPackPerceptualHash )
+                
+                # compile now, for the float32 dcts cv2 gives us
+                kernel( numpy.zeros( 64, dtype = numpy.float32 ) )
+                
+                THRESHOLD_AND_PACK_PERCEPTUAL_HASH_NUMBA = kernel
+                
+                NUMBA_OK = True
+                
+            except Exception as e:
+                
+                NUMBA_OK = False
+                
+            
+        
+        return NUMBA_OK
+        
+    
 def DiscardBlankPerceptualHashes( phashes ):
     
     phashes = { phash for phash in phashes if HydrusData.Get64BitHammingDistance( phash, CC.BLANK_PHASH ) > 4 }
@@ -30,7 +113,7 @@ def GenerateNumPyImage( path, mime ):
     
     return HydrusImageHandling.GenerateNumPyImage( path, mime, force_pil = force_pil )
     
-def GenerateShapePerceptualHashes( path, mime ):
+def GeneratePerceptualHashTinyImage( path, mime ):
     
     if HG.phash_generation_report_mode:
         
@@ -102,84 +185,65 @@ def GenerateShapePerceptualHashes( path, mime ):
         HydrusData.ShowText( 'phash generation: tiny image shape: {}'.format( numpy_image_tiny.shape ) )
         
     
-    # convert to float and calc dct
+    # convert to float for the dct
     
     numpy_image_tiny_float = numpy.float32( numpy_image_tiny )
     
     if HG.phash_generation_report_mode:
         
         HydrusData.ShowText( 'phash generation: tiny float image shape: {}'.format( numpy_image_tiny_float.shape ) )
-        HydrusData.ShowText( 'phash generation: generating dct' )
         
     
-    dct = cv2.dct( numpy_image_tiny_float )
-    
-    # take top left 8x8 of dct
-    
-    dct_88 = dct[:8,:8]
-    
-    # get median of dct
-    # exclude [0,0], which represents flat colour
-    # this [0,0] exclusion is apparently important for mean, but maybe it ain't so important for median--w/e
+    return numpy_image_tiny_float
     
-    # old mean code
-    # mask = numpy.ones( ( 8, 8 ) )
-    # mask[0,0] = 0
-    # average = numpy.average( dct_88, weights = mask )
+def GenerateShapePerceptualHashes( path, mime ):
     
-    median = numpy.median( dct_88.reshape( 64 )[1:] )
+    numpy_image_tiny_float = GeneratePerceptualHashTinyImage( path, mime )
     
     if HG.phash_generation_report_mode:
         
-        HydrusData.ShowText( 'phash generation: median: {}'.format( median ) )
+        HydrusData.ShowText( 'phash generation: generating dct' )
         
     
-    # make a monochromatic, 64-bit hash of whether the entry is above or below the median
+    dct = cv2.dct( numpy_image_tiny_float )
     
-    dct_88_boolean = dct_88 > median
+    # take top left 8x8 of dct
     
-    if HG.phash_generation_report_mode:
-        
-        HydrusData.ShowText( 'phash generation: collapsing bytes' )
-        
+    dct_88 = dct[:8,:8]
+    
+    threshold_and_pack_numba = None if HG.phash_generation_report_mode else GetThresholdAndPackPerceptualHashNumba()
     
-    # convert TTTFTFTF to 11101010 by repeatedly shifting answer and adding 0 or 1
-    # you can even go ( a << 1 ) + b and leave out the initial param on the reduce call as bools act like ints for this
-    # but let's not go crazy for another two nanoseconds
-    def collapse_bools_to_binary_uint( a, b ):
+    if threshold_and_pack_numba is not None:
         
-        return ( a << 1 ) + int( b )
+        phash = threshold_and_pack_numba( dct_88.reshape( 64 ) ).tobytes()
         
-    
-    list_of_bytes = []
-    
-    for i in range( 8 ):
+    else:
+        
+        # get median of dct
+        # exclude [0,0], which represents flat colour
+        # this [0,0] exclusion is apparently important for mean, but maybe it ain't so important for median--w/e
         
-        '''
-        # old way of doing it, which compared value to median every time
-        byte = 0
+        median = numpy.median( dct_88.reshape( 64 )[1:] )
         
-        for j in range( 8 ):
+        if HG.phash_generation_report_mode:
             
-            byte <<= 1 # shift byte one left
+            HydrusData.ShowText( 'phash generation: median: {}'.format( median ) )
             
-            value = dct_88[i,j]
+        
+        # make a monochromatic, 64-bit hash of whether the entry is above or below the median
+        
+        dct_88_boolean = dct_88 > median
+        
+        if HG.phash_generation_report_mode:
             
-            if value > median:
-                
-                byte |= 1
-                
+            HydrusData.ShowText( 'phash generation: collapsing bytes' )
             
-        '''
         
-        # this is a 0-255 int
-        byte = reduce( collapse_bools_to_binary_uint, dct_88_boolean[i], 0 )
+        # packbits goes big-endian, so each row of eight TTTFTFTF becomes the byte 11101010
         
-        list_of_bytes.append( byte )
+        phash = numpy.packbits( dct_88_boolean ).tobytes()
         
     
-    phash = bytes( list_of_bytes ) # this works!
-    
     if HG.phash_generation_report_mode:
         
         HydrusData.ShowText( 'phash generation: phash: {}'.format( phash.hex() ) )
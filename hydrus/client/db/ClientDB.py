@@ -322,6 +322,9 @@ class DB( HydrusDB.HydrusDB ):
         self._regen_tags_managers_hash_ids = set()
         self._regen_tags_managers_tag_ids = set()
         
+        # anything the import hash status cache has is from some other db
+        ClientImportFiles.FILE_IMPORT_HASH_STATUS_CACHE.Clear()
+        
         HydrusDB.HydrusDB.__init__( self, controller, db_dir, db_name )
         
     
@@ -8021,11 +8024,7 @@ class DB( HydrusDB.HydrusDB ):
             
             if not self._HashExists( hash ):
                 
-                f = ClientImportFiles.FileImportStatus.STATICGetUnknownStatus()
-                
-                f.hash = hash
-                
-                return f
+                return ClientImportFiles.FileImportStatus( CC.STATUS_UNKNOWN, hash )
                 
             else:
                 
@@ -15616,6 +15615,9 @@ class DB( HydrusDB.HydrusDB ):
     
     def pub_content_updates_after_commit( self, service_keys_to_content_updates ):
         
+        # we are still in the job here, so no import can read a status in between. this covers every file add, delete, undelete and record clear
+        ClientImportFiles.FILE_IMPORT_HASH_STATUS_CACHE.ProcessContentUpdates( service_keys_to_content_updates )
+        
         self._after_job_content_update_jobs.append( service_keys_to_content_updates )
         
     
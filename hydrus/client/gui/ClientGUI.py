@@ -37,6 +37,7 @@ from hydrus.core.networking import HydrusNetworking
 from hydrus.client import ClientApplicationCommand as CAC
 from hydrus.client import ClientConstants as CC
 from hydrus.client import ClientExporting
+from hydrus.client import ClientImageHandling
 from hydrus.client import ClientParsing
 from hydrus.client import ClientPaths
 from hydrus.client import ClientRendering
@@ -674,6 +675,17 @@ class FrameGUI( ClientGUITopLevelWindows.MainFrameThatResizes ):
         library_versions.append( ( 'lxml present: ', str( ClientParsing.LXML_IS_OK ) ) )
         library_versions.append( ( 'chardet present: ', str( HydrusText.CHARDET_OK ) ) )
         library_versions.append( ( 'lz4 present: ', str( ClientRendering.LZ4_OK ) ) )
+        
+        # we don't want to import it here just to say so, it can take a second
+        if ClientImageHandling.NUMBA_OK is None:
+            
+            library_versions.append( ( 'numba present: ', 'not checked until the first phash' ) )
+            
+        else:
+            
+            library_versions.append( ( 'numba present: ', str( ClientImageHandling.NUMBA_OK ) ) )
+            
+        
         library_versions.append( ( 'install dir', HC.BASE_DIR ) )
         library_versions.append( ( 'db dir', HG.client_controller.db_dir ) )
         library_versions.append( ( 'temp dir', HydrusTemp.GetCurrentTempDir() ) )
@@ -1,3 +1,5 @@
+import collections
+import threading
 import typing
 
 from hydrus.core import HydrusConstants as HC
@@ -13,12 +15,21 @@ from hydrus.client.importing.options import FileImportOptions
 
 class FileImportStatus( object ):
     
+    # we make a lot of these, so no __dict__
+    # they are immutable, so they are safe to share. make a new one if you want something different
+    __slots__ = ( 'status', 'hash', 'mime', 'note' )
+    
     def __init__( self, status, hash, mime = None, note = '' ):
         
-        self.status = status
-        self.hash = hash
-        self.mime = mime
-        self.note = note
+        object.__setattr__( self, 'status', status )
+        object.__setattr__( self, 'hash', hash )
+        object.__setattr__( self, 'mime', mime )
+        object.__setattr__( self, 'note', note )
+        
+    
+    def __setattr__( self, name, value ):
+        
+        raise AttributeError( 'File Import Status objects are immutable!' )
         
     
     def __str__( self ):
@@ -31,11 +42,6 @@ class FileImportStatus( object ):
         return self.status == CC.STATUS_SUCCESSFUL_BUT_REDUNDANT
         
     
-    def Duplicate( self ) -> "FileImportStatus":
-        
-        return FileImportStatus( self.status, self.hash, mime = self.mime, note = self.note )
-        
-    
     def ShouldImport( self, file_import_options: FileImportOptions.FileImportOptions ):
         
         if self.status == CC.STATUS_UNKNOWN:
@@ -56,22 +62,22 @@ class FileImportStatus( object ):
     
     def ToString( self ) -> str:
         
-        s = CC.status_string_lookup[ self.status ]
-        
-        if len( self.note ) > 0:
+        if len( self.note ) == 0:
             
-            s = '{}, {}'.format( s, self.note )
+            return CC.status_string_lookup[ self.status ]
             
         
-        return s
+        return '{}, {}'.format( CC.status_string_lookup[ self.status ], self.note )
         
     
     @staticmethod
     def STATICGetUnknownStatus() -> "FileImportStatus":
         
-        return FileImportStatus( CC.STATUS_UNKNOWN, None )
+        return UNKNOWN_FILE_IMPORT_STATUS
         
     
+UNKNOWN_FILE_IMPORT_STATUS = FileImportStatus( CC.STATUS_UNKNOWN, None )
+
 def CheckFileImportStatus( file_import_status: FileImportStatus ):
     
     if file_import_status.AlreadyInDB():
@@ -98,6 +104,180 @@ def CheckFileImportStatus( file_import_status: FileImportStatus ):
     
     return file_import_status
     
+class FileImportHashStatusCache( object ):
+    
+    # subscriptions and downloaders see the same files again and again, so let's not go to the db every time
+    # the db tells us directly about every file content update it makes, see ClientDB.pub_content_updates_after_commit
+    
+    def __init__( self, cache_size = 8192, timeout = 300 ):
+        
+        self._cache_size = cache_size
+        self._timeout = timeout
+        
+        self._hashes_to_statuses_and_times = collections.OrderedDict()
+        
+        # bumped on every invalidation, so a db read that raced with one does not put a stale status back in
+        self._invalidation_generation = 0
+        
+        self._lock = threading.Lock()
+        
+    
+    def Clear( self ):
+        
+        with self._lock:
+            
+            self._hashes_to_statuses_and_times = collections.OrderedDict()
+            
+            self._invalidation_generation += 1
+            
+        
+    
+    def GetHashStatus( self, hash: bytes ) -> FileImportStatus:
+        
+        with self._lock:
+            
+            if hash in self._hashes_to_statuses_and_times:
+                
+                ( file_import_status, time_fetched ) = self._hashes_to_statuses_and_times[ hash ]
+                
+                if HydrusData.TimeHasPassed( time_fetched + self._timeout ):
+                    
+                    del self._hashes_to_statuses_and_times[ hash ]
+                    
+                else:
+                    
+                    self._hashes_to_statuses_and_times.move_to_end( hash )
+                    
+                    return file_import_status
+                    
+                
+            
+            invalidation_generation = self._invalidation_generation
+            
+        
+        file_import_status = HG.client_controller.Read( 'hash_status', 'sha256', hash, prefix = 'file recognised' )
+        
+        # the db's notes for files it knows say 'which was N before this check', so a cached one would show the gap from the first lookup, not this one
+        cacheable = file_import_status.note == ''
+        
+        with self._lock:
+            
+            if cacheable and self._invalidation_generation == invalidation_generation:
+                
+                self._hashes_to_statuses_and_times[ hash ] = ( file_import_status, HydrusData.GetNow() )
+                
+                while len( self._hashes_to_statuses_and_times ) > self._cache_size:
+                    
+                    self._hashes_to_statuses_and_times.popitem( last = False )
+                    
+                
+            
+        
+        return file_import_status
+        
+    
+    def ProcessContentUpdates( self, service_keys_to_content_updates ):
+        
+        with self._lock:
+            
+            for content_updates in service_keys_to_content_updates.values():
+                
+                for content_update in content_updates:
+                    
+                    if content_update.GetDataType() != HC.CONTENT_TYPE_FILES:
+                        
+                        continue
+                        
+                    
+                    if content_update.GetAction() == HC.CONTENT_UPDATE_ADVANCED:
+                        
+                        # these can hit files we do not have the hashes of, so just start again
+                        
+                        self._hashes_to_statuses_and_times = collections.OrderedDict()
+                        
+                    else:
+                        
+                        for hash in content_update.GetHashes():
+                            
+                            if hash in self._hashes_to_statuses_and_times:
+                                
+                                del self._hashes_to_statuses_and_times[ hash ]
+                                
+                            
+                        
+                    
+                    self._invalidation_generation += 1
+                    
+                
+            
+        
+    
+FILE_IMPORT_HASH_STATUS_CACHE = FileImportHashStatusCache()
+
+class FileImportArchiveBatcher( object ):
+    
+    # a subscription full of files we already have can auto-archive thousands of them in a row, so we gather them up into one write
+    
+    def __init__( self, flush_size = 256, flush_delay = 1.0 ):
+        
+        self._flush_size = flush_size
+        self._flush_delay = flush_delay
+        
+        self._pending_hashes = set()
+        
+        self._flush_job = None
+        
+        self._lock = threading.Lock()
+        
+    
+    def AddHash( self, hash: bytes ):
+        
+        with self._lock:
+            
+            self._pending_hashes.add( hash )
+            
+            flush_now = len( self._pending_hashes ) >= self._flush_size or HG.model_shutdown
+            
+            if not flush_now and self._flush_job is None:
+                
+                self._flush_job = HG.client_controller.CallLater( self._flush_delay, self.Flush )
+                
+            
+        
+        if flush_now:
+            
+            self.Flush()
+            
+        
+    
+    def Flush( self ):
+        
+        with self._lock:
+            
+            if self._flush_job is not None:
+                
+                # if we filled up early, the timer would otherwise go off later and send the next batch off half-full
+                self._flush_job.Cancel()
+                
+                self._flush_job = None
+                
+            
+            hashes = self._pending_hashes
+            
+            self._pending_hashes = set()
+            
+        
+        if len( hashes ) > 0:
+            
+            # the pending set goes out as-is, one update for the whole batch. the write is queued, so it must not be anything we will touch again
+            service_keys_to_content_updates = { CC.COMBINED_LOCAL_FILE_SERVICE_KEY : [ HydrusData.ContentUpdate( HC.CONTENT_TYPE_FILES, HC.CONTENT_UPDATE_ARCHIVE, hashes ) ] }
+            
+            HG.client_controller.Write( 'content_updates', service_keys_to_content_updates )
+            
+        
+    
+FILE_IMPORT_ARCHIVE_BATCHER = FileImportArchiveBatcher()
+
 class FileImportJob( object ):
     
     def __init__( self, temp_path: str, file_import_options: FileImportOptions.FileImportOptions ):
@@ -110,13 +290,14 @@ class FileImportJob( object ):
         self._temp_path = temp_path
         self._file_import_options = file_import_options
         
-        self._pre_import_file_status = FileImportStatus.STATICGetUnknownStatus()
-        self._post_import_file_status = FileImportStatus.STATICGetUnknownStatus()
+        self._pre_import_file_status = UNKNOWN_FILE_IMPORT_STATUS
+        self._post_import_file_status = UNKNOWN_FILE_IMPORT_STATUS
         
         self._file_info = None
         self._thumbnail_bytes = None
         self._phashes = None
         self._extra_hashes = None
+        self._header_bytes = None
         self._file_modified_timestamp = None
         
     
@@ -134,7 +315,9 @@ class FileImportJob( object ):
     
     def DoWork( self, status_hook = None ) -> FileImportStatus:
         
-        if HG.file_import_report_mode:
+        report_mode = HG.file_import_report_mode
+        
+        if report_mode:
             
             HydrusData.ShowText( 'File import job starting work.' )
             
@@ -155,10 +338,7 @@ class FileImportJob( object ):
                 
                 ok_to_go = False
                 
-                not_ok_file_import_status = self._pre_import_file_status.Duplicate()
-                
-                not_ok_file_import_status.status = CC.STATUS_VETOED
-                not_ok_file_import_status.note = str( e )
+                not_ok_file_import_status = FileImportStatus( CC.STATUS_VETOED, self._pre_import_file_status.hash, mime = self._pre_import_file_status.mime, note = str( e ) )
                 
             
             if ok_to_go:
@@ -187,10 +367,10 @@ class FileImportJob( object ):
             
         else:
             
-            self._post_import_file_status = self._pre_import_file_status.Duplicate()
+            self._post_import_file_status = self._pre_import_file_status
             
         
-        if HG.file_import_report_mode:
+        if report_mode:
             
             HydrusData.ShowText( 'File import job is done, now publishing content updates' )
             
@@ -202,16 +382,25 @@ class FileImportJob( object ):
     
     def GeneratePreImportHashAndStatus( self, status_hook = None ):
         
-        HydrusImageHandling.ConvertToPNGIfBMP( self._temp_path )
+        report_mode = HG.file_import_report_mode
         
         if status_hook is not None:
             
             status_hook( 'calculating hash' )
             
         
-        hash = HydrusFileHandling.GetHashFromPath( self._temp_path )
+        # we only want the sha256 right now. many files turn out to be already in db or deleted, so the other hashes wait for GenerateInfo
+        # we keep the header from this read for the bmp and filetype checks
+        ( ( hash, ), self._header_bytes ) = HydrusFileHandling.GetHashesAndHeaderFromPath( self._temp_path, ( 'sha256', ) )
         
-        if HG.file_import_report_mode:
+        if HydrusImageHandling.ConvertToPNGIfBMP( self._temp_path, header_bytes = self._header_bytes ):
+            
+            # bmps are rare, so we only pay for a second read when we actually rewrote the file
+            
+            ( ( hash, ), self._header_bytes ) = HydrusFileHandling.GetHashesAndHeaderFromPath( self._temp_path, ( 'sha256', ) )
+            
+        
+        if report_mode:
             
             HydrusData.ShowText( 'File import job hash: {}'.format( hash.hex() ) )
             
@@ -221,14 +410,14 @@ class FileImportJob( object ):
             status_hook( 'checking for file status' )
             
         
-        self._pre_import_file_status = HG.client_controller.Read( 'hash_status', 'sha256', hash, prefix = 'file recognised' )
+        file_import_status = FILE_IMPORT_HASH_STATUS_CACHE.GetHashStatus( hash )
         
         # just in case
-        self._pre_import_file_status.hash = hash
+        file_import_status = FileImportStatus( file_import_status.status, hash, mime = file_import_status.mime, note = file_import_status.note )
         
-        self._pre_import_file_status = CheckFileImportStatus( self._pre_import_file_status )
+        self._pre_import_file_status = CheckFileImportStatus( file_import_status )
         
-        if HG.file_import_report_mode:
+        if report_mode:
             
             HydrusData.ShowText( 'File import job pre-import status: {}'.format( self._pre_import_file_status.ToString() ) )
             
@@ -236,6 +425,8 @@ class FileImportJob( object ):
     
     def GenerateInfo( self, status_hook = None ):
         
+        report_mode = HG.file_import_report_mode
+        
         if self._pre_import_file_status.mime is None:
             
             if status_hook is not None:
@@ -243,16 +434,16 @@ class FileImportJob( object ):
                 status_hook( 'generating filetype' )
                 
             
-            mime = HydrusFileHandling.GetMime( self._temp_path )
+            mime = HydrusFileHandling.GetMime( self._temp_path, header_bytes = self._header_bytes )
             
-            self._pre_import_file_status.mime = mime
+            self._pre_import_file_status = FileImportStatus( self._pre_import_file_status.status, self._pre_import_file_status.hash, mime = mime, note = self._pre_import_file_status.note )
             
         else:
             
             mime = self._pre_import_file_status.mime
             
         
-        if HG.file_import_report_mode:
+        if report_mode:
             
             HydrusData.ShowText( 'File import job mime: {}'.format( HC.mime_string_lookup[ mime ] ) )
             
@@ -261,14 +452,14 @@ class FileImportJob( object ):
         
         if mime in HC.DECOMPRESSION_BOMB_IMAGES and not self._file_import_options.AllowsDecompressionBombs():
             
-            if HG.file_import_report_mode:
+            if report_mode:
                 
                 HydrusData.ShowText( 'File import job testing for decompression bomb' )
                 
             
             if HydrusImageHandling.IsDecompressionBomb( self._temp_path ):
                 
-                if HG.file_import_report_mode:
+                if report_mode:
                     
                     HydrusData.ShowText( 'File import job: it was a decompression bomb' )
                     
@@ -286,7 +477,7 @@ class FileImportJob( object ):
         
         ( size, mime, width, height, duration, num_frames, has_audio, num_words ) = self._file_info
         
-        if HG.file_import_report_mode:
+        if report_mode:
             
             HydrusData.ShowText( 'File import job file info: {}'.format( self._file_info ) )
             
@@ -298,7 +489,7 @@ class FileImportJob( object ):
                 status_hook( 'generating thumbnail' )
                 
             
-            if HG.file_import_report_mode:
+            if report_mode:
                 
                 HydrusData.ShowText( 'File import job generating thumbnail' )
                 
@@ -326,20 +517,20 @@ class FileImportJob( object ):
                 status_hook( 'generating similar files metadata' )
                 
             
-            if HG.file_import_report_mode:
+            if report_mode:
                 
                 HydrusData.ShowText( 'File import job generating phashes' )
                 
             
             self._phashes = ClientImageHandling.GenerateShapePerceptualHashes( self._temp_path, mime )
             
-            if HG.file_import_report_mode:
+            if report_mode:
                 
                 HydrusData.ShowText( 'File import job generated {} phashes: {}'.format( len( self._phashes ), [ phash.hex() for phash in self._phashes ] ) )
                 
             
         
-        if HG.file_import_report_mode:
+        if report_mode:
             
             HydrusData.ShowText( 'File import job generating other hashes' )
             
@@ -389,15 +580,16 @@ class FileImportJob( object ):
         return self._phashes
         
     
+    def GetPreImportStatus( self ) -> FileImportStatus:
+        
+        return self._pre_import_file_status
+        
+    
     def PubsubContentUpdates( self ):
         
         if self._post_import_file_status.AlreadyInDB() and self._file_import_options.AutomaticallyArchives():
             
-            hashes = { self.GetHash() }
-            
-            service_keys_to_content_updates = { CC.COMBINED_LOCAL_FILE_SERVICE_KEY : [ HydrusData.ContentUpdate( HC.CONTENT_TYPE_FILES, HC.CONTENT_UPDATE_ARCHIVE, hashes ) ] }
-            
-            HG.client_controller.Write( 'content_updates', service_keys_to_content_updates )
+            FILE_IMPORT_ARCHIVE_BATCHER.AddHash( self.GetHash() )
             
         
     
\ No newline at end of file
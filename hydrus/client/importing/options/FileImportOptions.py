@@ -3,10 +3,40 @@ import os
 from hydrus.core import HydrusConstants as HC
 from hydrus.core import HydrusData
 from hydrus.core import HydrusExceptions
+from hydrus.core import HydrusGlobals as HG
 from hydrus.core import HydrusSerialisable
 
 from hydrus.client.importing.options import ClientImportOptions
 
+# most option objects are default or near it, so identical option tuples get shared rather than each object holding its own
+TUPLE_INTERN = {}
+TUPLE_INTERN_MAX_SIZE = 1024
+
+def InternTuple( t ):
+    
+    try:
+        
+        interned_t = TUPLE_INTERN.get( t, None )
+        
+    except TypeError:
+        
+        # unhashable contents, e.g. a resolution that came back from json as a list
+        
+        return t
+        
+    
+    if interned_t is not None:
+        
+        return interned_t
+        
+    
+    if len( TUPLE_INTERN ) >= TUPLE_INTERN_MAX_SIZE:
+        
+        TUPLE_INTERN.clear()
+        
+    
+    return TUPLE_INTERN.setdefault( t, t )
+    
 class FileImportOptions( HydrusSerialisable.SerialisableBase ):
     
     SERIALISABLE_TYPE = HydrusSerialisable.SERIALISABLE_TYPE_FILE_IMPORT_OPTIONS
@@ -33,147 +63,285 @@ class FileImportOptions( HydrusSerialisable.SerialisableBase ):
         self._present_already_in_inbox_files = True
         self._present_already_in_archive_files = True
         
+        self._ClearCachedValues()
+        self._RefreshValidators()
+        
     
-    def _GetSerialisableInfo( self ):
+    def _CheckHumanBytesFormat( self ):
         
-        pre_import_options = ( self._exclude_deleted, self._do_not_check_known_urls_before_importing, self._do_not_check_hashes_before_importing, self._allow_decompression_bombs, self._min_size, self._max_size, self._max_gif_size, self._min_resolution, self._max_resolution )
-        post_import_options = ( self._automatic_archive, self._associate_primary_urls, self._associate_source_urls )
-        presentation_options = ( self._present_new_files, self._present_already_in_inbox_files, self._present_already_in_archive_files )
+        # the summary and limit strings have sizes in them, which follow the user's sig figs option, so if that changes, what we remember is stale
         
-        return ( pre_import_options, post_import_options, presentation_options )
+        human_bytes_sig_figs = HG.client_controller.new_options.GetInteger( 'human_bytes_sig_figs' )
+        
+        if human_bytes_sig_figs != self._human_bytes_sig_figs:
+            
+            self._summary = None
+            self._limit_strings = {}
+            
+            self._human_bytes_sig_figs = human_bytes_sig_figs
+            
         
     
-    def _InitialiseFromSerialisableInfo( self, serialisable_info ):
+    def _ClearCachedValues( self ):
         
-        ( pre_import_options, post_import_options, presentation_options ) = serialisable_info
+        # the ui polls the summary a lot, so we remember it until something changes
         
-        ( self._exclude_deleted, self._do_not_check_known_urls_before_importing, self._do_not_check_hashes_before_importing, self._allow_decompression_bombs, self._min_size, self._max_size, self._max_gif_size, self._min_resolution, self._max_resolution ) = pre_import_options
-        ( self._automatic_archive, self._associate_primary_urls, self._associate_source_urls ) = post_import_options
-        ( self._present_new_files, self._present_already_in_inbox_files, self._present_already_in_archive_files ) = presentation_options 
+        self._human_bytes_sig_figs = None
+        self._summary = None
+        self._pre_import_options = None
+        self._presentation_options = None
         
     
-    def _UpdateSerialisableInfo( self, version, old_serialisable_info ):
+    def _GenerateSummary( self ):
+        
+        statements = []
         
-        if version == 1:
+        if self._exclude_deleted:
+            
+            statements.append( 'excluding previously deleted' )
             
-            ( automatic_archive, exclude_deleted, min_size, min_resolution ) = old_serialisable_info
+        
+        if not self._allow_decompression_bombs:
             
-            present_new_files = True
-            present_already_in_inbox_files = False
-            present_already_in_archive_files = False
+            statements.append( 'excluding decompression bombs' )
             
-            new_serialisable_info = ( automatic_archive, exclude_deleted, present_new_files, present_already_in_inbox_files, present_already_in_archive_files, min_size, min_resolution )
+        
+        if self._min_size is not None:
             
-            return ( 2, new_serialisable_info )
+            statements.append( 'excluding < ' + HydrusData.ToHumanBytes( self._min_size ) )
             
         
-        if version == 2:
+        if self._max_size is not None:
             
-            ( automatic_archive, exclude_deleted, present_new_files, present_already_in_inbox_files, present_already_in_archive_files, min_size, min_resolution ) = old_serialisable_info
+            statements.append( 'excluding > ' + HydrusData.ToHumanBytes( self._max_size ) )
             
-            max_size = None
-            max_resolution = None
+        
+        if self._max_gif_size is not None:
             
-            allow_decompression_bombs = True
-            max_gif_size = 32 * 1048576
+            statements.append( 'excluding gifs > ' + HydrusData.ToHumanBytes( self._max_gif_size ) )
             
-            pre_import_options = ( exclude_deleted, allow_decompression_bombs, min_size, max_size, max_gif_size, min_resolution, max_resolution )
-            post_import_options = automatic_archive
-            presentation_options = ( present_new_files, present_already_in_inbox_files, present_already_in_archive_files )
+        
+        if self._min_resolution is not None:
             
-            new_serialisable_info = ( pre_import_options, post_import_options, presentation_options )
+            ( width, height ) = self._min_resolution
             
-            return ( 3, new_serialisable_info )
+            statements.append( 'excluding < ( ' + HydrusData.ToHumanInt( width ) + ' x ' + HydrusData.ToHumanInt( height ) + ' )' )
             
         
-        if version == 3:
+        if self._max_resolution is not None:
             
-            ( pre_import_options, post_import_options, presentation_options ) = old_serialisable_info
+            ( width, height ) = self._max_resolution
             
-            ( exclude_deleted, allow_decompression_bombs, min_size, max_size, max_gif_size, min_resolution, max_resolution ) = pre_import_options
+            statements.append( 'excluding > ( ' + HydrusData.ToHumanInt( width ) + ' x ' + HydrusData.ToHumanInt( height ) + ' )' )
             
-            automatic_archive = post_import_options
+        
+        #
+        
+        if self._automatic_archive:
             
-            do_not_check_known_urls_before_importing = False
-            do_not_check_hashes_before_importing = False
-            associate_source_urls = True
+            statements.append( 'automatically archiving' )
             
-            pre_import_options = ( exclude_deleted, do_not_check_known_urls_before_importing, do_not_check_hashes_before_importing, allow_decompression_bombs, min_size, max_size, max_gif_size, min_resolution, max_resolution )
+        
+        #
+        
+        presentation_statements = []
+        
+        if self._present_new_files:
             
-            post_import_options = ( automatic_archive, associate_source_urls )
+            presentation_statements.append( 'new' )
             
-            new_serialisable_info = ( pre_import_options, post_import_options, presentation_options )
+        
+        if self._present_already_in_inbox_files:
             
-            return ( 4, new_serialisable_info )
+            presentation_statements.append( 'already in inbox' )
             
         
-        if version == 4:
+        if self._present_already_in_archive_files:
+            
+            presentation_statements.append( 'already in archive' )
             
-            ( pre_import_options, post_import_options, presentation_options ) = old_serialisable_info
+        
+        if len( presentation_statements ) == 0:
             
-            ( automatic_archive, associate_source_urls ) = post_import_options
+            statements.append( 'not presenting any files' )
             
-            associate_primary_urls = True
+        elif len( presentation_statements ) == 3:
             
-            post_import_options = ( automatic_archive, associate_primary_urls, associate_source_urls )
+            statements.append( 'presenting all files' )
             
-            new_serialisable_info = ( pre_import_options, post_import_options, presentation_options )
+        else:
             
-            return ( 5, new_serialisable_info )
+            statements.append( 'presenting ' + ', '.join( presentation_statements ) + ' files' )
             
         
+        summary = os.linesep.join( statements )
+        
+        return summary
+        
     
-    def AllowsDecompressionBombs( self ):
+    def _GetLimitString( self, name ):
         
-        return self._allow_decompression_bombs
+        self._CheckHumanBytesFormat()
+        
+        if name not in self._limit_strings:
+            
+            limit = getattr( self, '_' + name )
+            
+            if name in ( 'min_resolution', 'max_resolution' ):
+                
+                self._limit_strings[ name ] = HydrusData.ConvertResolutionToPrettyString( limit )
+                
+            else:
+                
+                self._limit_strings[ name ] = HydrusData.ToHumanBytes( limit )
+                
+            
+        
+        return self._limit_strings[ name ]
         
     
-    def AutomaticallyArchives( self ) -> bool:
+    def _GetSerialisableInfo( self ):
         
-        return self._automatic_archive
+        pre_import_options = ( self._exclude_deleted, self._do_not_check_known_urls_before_importing, self._do_not_check_hashes_before_importing, self._allow_decompression_bombs, self._min_size, self._max_size, self._max_gif_size, self._min_resolution, self._max_resolution )
+        post_import_options = ( self._automatic_archive, self._associate_primary_urls, self._associate_source_urls )
+        presentation_options = ( self._present_new_files, self._present_already_in_inbox_files, self._present_already_in_archive_files )
+        
+        return InternTuple( ( InternTuple( pre_import_options ), InternTuple( post_import_options ), InternTuple( presentation_options ) ) )
         
     
-    def CheckFileIsValid( self, size, mime, width, height ):
+    def _InitialiseFromSerialisableInfo( self, serialisable_info ):
         
-        if self._min_size is not None and size < self._min_size:
+        ( pre_import_options, post_import_options, presentation_options ) = serialisable_info
+        
+        ( self._exclude_deleted, self._do_not_check_known_urls_before_importing, self._do_not_check_hashes_before_importing, self._allow_decompression_bombs, self._min_size, self._max_size, self._max_gif_size, self._min_resolution, self._max_resolution ) = pre_import_options
+        ( self._automatic_archive, self._associate_primary_urls, self._associate_source_urls ) = post_import_options
+        ( self._present_new_files, self._present_already_in_inbox_files, self._present_already_in_archive_files ) = presentation_options 
+        
+        self._ClearCachedValues()
+        self._RefreshValidators()
+        
+    
+    def _RefreshValidators( self ):
+        
+        # CheckFileIsValid is called for every import, so we figure out which tests are active here, once, and then it only runs those
+        # limit strings for error text are formatted on first need and kept until the limits change. human bytes reads the client options, which may not exist yet here
+        
+        self._limit_strings = {}
+        
+        validators = []
+        
+        if self._min_size is not None:
+            
+            min_size = self._min_size
             
-            raise HydrusExceptions.FileSizeException( 'File was ' + HydrusData.ToHumanBytes( size ) + ' but the lower limit is ' + HydrusData.ToHumanBytes( self._min_size ) + '.' )
+            def check_min_size( size, mime, width, height ):
+                
+                if size < min_size:
+                    
+                    raise HydrusExceptions.FileSizeException( 'File was ' + HydrusData.ToHumanBytes( size ) + ' but the lower limit is ' + self._GetLimitString( 'min_size' ) + '.' )
+                    
+                
+            
+            validators.append( check_min_size )
             
         
-        if self._max_size is not None and size > self._max_size:
+        if self._max_size is not None:
             
-            raise HydrusExceptions.FileSizeException( 'File was ' + HydrusData.ToHumanBytes( size ) + ' but the upper limit is ' + HydrusData.ToHumanBytes( self._max_size ) + '.' )
+            max_size = self._max_size
+            
+            def check_max_size( size, mime, width, height ):
+                
+                if size > max_size:
+                    
+                    raise HydrusExceptions.FileSizeException( 'File was ' + HydrusData.ToHumanBytes( size ) + ' but the upper limit is ' + self._GetLimitString( 'max_size' ) + '.' )
+                    
+                
+            
+            validators.append( check_max_size )
             
         
-        if mime == HC.IMAGE_GIF and self._max_gif_size is not None and size > self._max_gif_size:
+        if self._max_gif_size is not None:
             
-            raise HydrusExceptions.FileSizeException( 'File was ' + HydrusData.ToHumanBytes( size ) + ' but the upper limit for gifs is ' + HydrusData.ToHumanBytes( self._max_gif_size ) + '.' )
+            max_gif_size = self._max_gif_size
+            
+            def check_max_gif_size( size, mime, width, height ):
+                
+                if mime == HC.IMAGE_GIF and size > max_gif_size:
+                    
+                    raise HydrusExceptions.FileSizeException( 'File was ' + HydrusData.ToHumanBytes( size ) + ' but the upper limit for gifs is ' + self._GetLimitString( 'max_gif_size' ) + '.' )
+                    
+                
+            
+            validators.append( check_max_gif_size )
             
         
         if self._min_resolution is not None:
             
-            ( min_width, min_height ) = self._min_resolution
             
-            too_thin = width is not None and width < min_width
-            too_short = height is not None and height < min_height
+            ( min_width, min_height ) = self._min_resolution
             
-            if too_thin or too_short:
+            def check_min_resolution( size, mime, width, height ):
                 
-                raise HydrusExceptions.FileSizeException( 'File had resolution ' + HydrusData.ConvertResolutionToPrettyString( ( width, height ) ) + ' but the lower limit is ' + HydrusData.ConvertResolutionToPrettyString( self._min_resolution ) )
+                too_thin = width is not None and width < min_width
+                too_short = height is not None and height < min_height
                 
+                if too_thin or too_short:
+                    
+                    raise HydrusExceptions.FileSizeException( 'File had resolution ' + HydrusData.ConvertResolutionToPrettyString( ( width, height ) ) + ' but the lower limit is ' + self._GetLimitString( 'min_resolution' ) )
+                    
+                
+            
+            validators.append( check_min_resolution )
             
         
         if self._max_resolution is not None:
             
-            ( max_width, max_height ) = self._max_resolution
             
-            too_wide = width is not None and width > max_width
-            too_tall = height is not None and height > max_height
+            ( max_width, max_height ) = self._max_resolution
             
-            if too_wide or too_tall:
+            def check_max_resolution( size, mime, width, height ):
                 
-                raise HydrusExceptions.FileSizeException( 'File had resolution ' + HydrusData.ConvertResolutionToPrettyString( ( width, height ) ) + ' but the upper limit is ' + HydrusData.ConvertResolutionToPrettyString( self._max_resolution ) )
+                too_wide = width is not None and width > max_width
+                too_tall = height is not None and height > max_height
                 
+                if too_wide or too_tall:
+                    
+                    raise HydrusExceptions.FileSizeException( 'File had resolution ' + HydrusData.ConvertResolutionToPrettyString( ( width, height ) ) + ' but the upper limit is ' + self._GetLimitString( 'max_resolution' ) )
+                    
+                
+            
+            validators.append( check_max_resolution )
+            
+        
+        self._validators = tuple( validators )
+        
+    
+    def _UpdateSerialisableInfo( self, version, old_serialisable_info ):
+        
+        if version < 5:
+            
+            # old updates are rarely needed, so they live elsewhere and are only loaded when they are
+            from hydrus.client.importing.options import FileImportOptionsLegacy
+            
+            return FileImportOptionsLegacy.UpdateSerialisableInfo( version, old_serialisable_info )
+            
+        
+    
+    def AllowsDecompressionBombs( self ):
+        
+        return self._allow_decompression_bombs
+        
+    
+    def AutomaticallyArchives( self ) -> bool:
+        
+        return self._automatic_archive
+        
+    
+    def CheckFileIsValid( self, size, mime, width, height ):
+        
+        for validator in self._validators:
+            
+            validator( size, mime, width, height )
             
         
     
@@ -192,20 +360,20 @@ class FileImportOptions( HydrusSerialisable.SerialisableBase ):
             
             if possible_mime == HC.IMAGE_GIF and self._max_gif_size is not None and num_bytes > self._max_gif_size:
                 
-                raise HydrusExceptions.FileSizeException( error_prefix + HydrusData.ToHumanBytes( num_bytes ) + ' but the upper limit for gifs is ' + HydrusData.ToHumanBytes( self._max_gif_size ) + '.' )
+                raise HydrusExceptions.FileSizeException( error_prefix + HydrusData.ToHumanBytes( num_bytes ) + ' but the upper limit for gifs is ' + self._GetLimitString( 'max_gif_size' ) + '.' )
                 
             
         
         if self._max_size is not None and num_bytes > self._max_size:
             
-            raise HydrusExceptions.FileSizeException( error_prefix + HydrusData.ToHumanBytes( num_bytes ) + ' but the upper limit is ' + HydrusData.ToHumanBytes( self._max_size ) + '.' )
+            raise HydrusExceptions.FileSizeException( error_prefix + HydrusData.ToHumanBytes( num_bytes ) + ' but the upper limit is ' + self._GetLimitString( 'max_size' ) + '.' )
             
         
         if is_complete_file_size:
             
             if self._min_size is not None and num_bytes < self._min_size:
                 
-                raise HydrusExceptions.FileSizeException( error_prefix + HydrusData.ToHumanBytes( num_bytes ) + ' but the lower limit is ' + HydrusData.ToHumanBytes( self._min_size ) + '.' )
+                raise HydrusExceptions.FileSizeException( error_prefix + HydrusData.ToHumanBytes( num_bytes ) + ' but the lower limit is ' + self._GetLimitString( 'min_size' ) + '.' )
                 
             
         
@@ -217,103 +385,34 @@ class FileImportOptions( HydrusSerialisable.SerialisableBase ):
     
     def GetPresentationOptions( self ):
         
-        presentation_options = ( self._present_new_files, self._present_already_in_inbox_files, self._present_already_in_archive_files )
-        
-        return presentation_options
-        
-    
-    def GetPreImportOptions( self ):
-        
-        pre_import_options = ( self._exclude_deleted, self._do_not_check_known_urls_before_importing, self._do_not_check_hashes_before_importing, self._allow_decompression_bombs, self._min_size, self._max_size, self._max_gif_size, self._min_resolution, self._max_resolution )
-        
-        return pre_import_options
-        
-    
-    def GetSummary( self ):
-        
-        statements = []
-        
-        if self._exclude_deleted:
-            
-            statements.append( 'excluding previously deleted' )
-            
-        
-        if not self._allow_decompression_bombs:
-            
-            statements.append( 'excluding decompression bombs' )
-            
-        
-        if self._min_size is not None:
-            
-            statements.append( 'excluding < ' + HydrusData.ToHumanBytes( self._min_size ) )
-            
-        
-        if self._max_size is not None:
-            
-            statements.append( 'excluding > ' + HydrusData.ToHumanBytes( self._max_size ) )
-            
-        
-        if self._max_gif_size is not None:
+        if self._presentation_options is None:
             
-            statements.append( 'excluding gifs > ' + HydrusData.ToHumanBytes( self._max_gif_size ) )
+            self._presentation_options = InternTuple( ( self._present_new_files, self._present_already_in_inbox_files, self._present_already_in_archive_files ) )
             
         
-        if self._min_resolution is not None:
-            
-            ( width, height ) = self._min_resolution
-            
-            statements.append( 'excluding < ( ' + HydrusData.ToHumanInt( width ) + ' x ' + HydrusData.ToHumanInt( height ) + ' )' )
-            
+        return self._presentation_options
         
-        if self._max_resolution is not None:
-            
-            ( width, height ) = self._max_resolution
-            
-            statements.append( 'excluding > ( ' + HydrusData.ToHumanInt( width ) + ' x ' + HydrusData.ToHumanInt( height ) + ' )' )
-            
-        
-        #
+    
+    def GetPreImportOptions( self ):
         
-        if self._automatic_archive:
+        if self._pre_import_options is None:
             
-            statements.append( 'automatically archiving' )
+            self._pre_import_options = InternTuple( ( self._exclude_deleted, self._do_not_check_known_urls_before_importing, self._do_not_check_hashes_before_importing, self._allow_decompression_bombs, self._min_size, self._max_size, self._max_gif_size, self._min_resolution, self._max_resolution ) )
             
         
-        #
-        
-        presentation_statements = []
-        
-        if self._present_new_files:
-            
-            presentation_statements.append( 'new' )
-            
+        return self._pre_import_options
         
-        if self._present_already_in_inbox_files:
-            
-            presentation_statements.append( 'already in inbox' )
-            
+    
+    def GetSummary( self ):
         
-        if self._present_already_in_archive_files:
-            
-            presentation_statements.append( 'already in archive' )
-            
+        self._CheckHumanBytesFormat()
         
-        if len( presentation_statements ) == 0:
+        if self._summary is None:
             
-            statements.append( 'not presenting any files' )
-            
-        elif len( presentation_statements ) == 3:
-            
-            statements.append( 'presenting all files' )
-            
-        else:
+            self._summary = self._GenerateSummary()
             
-            statements.append( 'presenting ' + ', '.join( presentation_statements ) + ' files' )
-            
-        
-        summary = os.linesep.join( statements )
         
-        return summary
+        return self._summary
         
     
     def SetPostImportOptions( self, automatic_archive: bool, associate_primary_urls: bool, associate_source_urls: bool ):
@@ -322,6 +421,8 @@ class FileImportOptions( HydrusSerialisable.SerialisableBase ):
         self._associate_primary_urls = associate_primary_urls
         self._associate_source_urls = associate_source_urls
         
+        self._ClearCachedValues()
+        
     
     def SetPresentationOptions( self, present_new_files, present_already_in_inbox_files, present_already_in_archive_files ):
         
@@ -329,6 +430,8 @@ class FileImportOptions( HydrusSerialisable.SerialisableBase ):
         self._present_already_in_inbox_files = present_already_in_inbox_files
         self._present_already_in_archive_files = present_already_in_archive_files
         
+        self._ClearCachedValues()
+        
     
     def SetPreImportOptions( self, exclude_deleted, do_not_check_known_urls_before_importing, do_not_check_hashes_before_importing, allow_decompression_bombs, min_size, max_size, max_gif_size, min_resolution, max_resolution ):
         
@@ -342,6 +445,9 @@ class FileImportOptions( HydrusSerialisable.SerialisableBase ):
         self._min_resolution = min_resolution
         self._max_resolution = max_resolution
         
+        self._ClearCachedValues()
+        self._RefreshValidators()
+        
     
     def ShouldAssociatePrimaryURLs( self ) -> bool:
         
@@ -0,0 +1,72 @@
+# updates for FileImportOptions serialisable versions 1 to 5, split off since they are only needed for very old objects
+
+def UpdateSerialisableInfo( version, old_serialisable_info ):
+    
+    if version == 1:
+        
+        ( automatic_archive, exclude_deleted, min_size, min_resolution ) = old_serialisable_info
+        
+        present_new_files = True
+        present_already_in_inbox_files = False
+        present_already_in_archive_files = False
+        
+        new_serialisable_info = ( automatic_archive, exclude_deleted, present_new_files, present_already_in_inbox_files, present_already_in_archive_files, min_size, min_resolution )
+        
+        return ( 2, new_serialisable_info )
+        
+    
+    if version == 2:
+        
+        ( automatic_archive, exclude_deleted, present_new_files, present_already_in_inbox_files, present_already_in_archive_files, min_size, min_resolution ) = old_serialisable_info
+        
+        max_size = None
+        max_resolution = None
+        
+        allow_decompression_bombs = True
+        max_gif_size = 32 * 1048576
+        
+        pre_import_options = ( exclude_deleted, allow_decompression_bombs, min_size, max_size, max_gif_size, min_resolution, max_resolution )
+        post_import_options = automatic_archive
+        presentation_options = ( present_new_files, present_already_in_inbox_files, present_already_in_archive_files )
+        
+        new_serialisable_info = ( pre_import_options, post_import_options, presentation_options )
+        
+        return ( 3, new_serialisable_info )
+        
+    
+    if version == 3:
+        
+        ( pre_import_options, post_import_options, presentation_options ) = old_serialisable_info
+        
+        ( exclude_deleted, allow_decompression_bombs, min_size, max_size, max_gif_size, min_resolution, max_resolution ) = pre_import_options
+        
+        automatic_archive = post_import_options
+        
+        do_not_check_known_urls_before_importing = False
+        do_not_check_hashes_before_importing = False
+        associate_source_urls = True
+        
+        pre_import_options = ( exclude_deleted, do_not_check_known_urls_before_importing, do_not_check_hashes_before_importing, allow_decompression_bombs, min_size, max_size, max_gif_size, min_resolution, max_resolution )
+        
+        post_import_options = ( automatic_archive, associate_source_urls )
+        
+        new_serialisable_info = ( pre_import_options, post_import_options, presentation_options )
+        
+        return ( 4, new_serialisable_info )
+        
+    
+    if version == 4:
+        
+        ( pre_import_options, post_import_options, presentation_options ) = old_serialisable_info
+        
+        ( automatic_archive, associate_source_urls ) = post_import_options
+        
+        associate_primary_urls = True
+        
+        post_import_options = ( automatic_archive, associate_primary_urls, associate_source_urls )
+        
+        new_serialisable_info = ( pre_import_options, post_import_options, presentation_options )
+        
+        return ( 5, new_serialisable_info )
+        
+    
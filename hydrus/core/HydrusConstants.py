@@ -89,6 +89,8 @@ SERVER_THUMBNAIL_DIMENSIONS = ( 200, 200 )
 HYDRUS_KEY_LENGTH = 32
 
 READ_BLOCK_SIZE = 256 * 1024
+HASH_READ_BLOCK_SIZE = 1024 * 1024
+HASH_MMAP_SIZE_THRESHOLD = 8 * 1024 * 1024
 
 lifetimes = [ ( 'one month', 30 * 86400 ), ( 'three months', 3 * 30 * 86400 ), ( 'six months', 6 * 30 * 86400 ), ( 'one year', 365 * 86400 ), ( 'two years', 2 * 365 * 86400 ), ( 'five years', 5 * 365 * 86400 ), ( 'does not expire', None ) ]
 
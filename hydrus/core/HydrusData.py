@@ -1787,6 +1787,9 @@ class Call( object ):
     
 class ContentUpdate( object ):
     
+    # we make a lot of these
+    __slots__ = ( '_data_type', '_action', '_row', '_reason' )
+    
     def __init__( self, data_type, action, row, reason = None ):
         
         self._data_type = data_type
@@ -1,4 +1,5 @@
 import hashlib
+import mmap
 import os
 import struct
 
@@ -17,8 +18,15 @@ from hydrus.core import HydrusText
 from hydrus.core import HydrusVideoHandling
 from hydrus.core.networking import HydrusNetwork
 
+# Hashing
+
+# the client swaps in what suits this machine once it has booted, see InitialiseHashBlockSize
+HASH_BLOCK_SIZE = HC.HASH_READ_BLOCK_SIZE
+
 # Mime
 
+MIME_HEADER_SIZE = 256
+
 headers_and_mime = [
     ( ( ( 0, b'\xff\xd8' ), ), HC.IMAGE_JPEG ),
     ( ( ( 0, b'GIF87a' ), ), HC.IMAGE_GIF ),
@@ -59,6 +67,47 @@ headers_and_mime = [
     ( ( ( 0, b'\x30\x26\xB2\x75\x8E\x66\xCF\x11\xA6\xD9\x00\xAA\x00\x62\xCE\x6C' ), ), HC.UNDETERMINED_WM )
     ]
 
+def BenchmarkHashBlockSize():
+    
+    # the best block size depends on cpu cache size and whether the cpu has sha extensions, so we test what this machine likes
+    # we hash in memory, so this is just the hashing side. the disk side is handled by the sequential read hint and mmap
+    # sha256 is the hash on the hot path, since it is the only one a file we already have ever gets
+    
+    scratch = memoryview( os.urandom( 16 * 1024 * 1024 ) )
+    
+    block_sizes = ( 64 * 1024, 256 * 1024, 1024 * 1024, 4 * 1024 * 1024 )
+    
+    # warm up, so the first size timed does not pay for faulting the buffer in
+    GetHashesFromBuffer( scratch, ( 'sha256', ), block_size = HC.HASH_READ_BLOCK_SIZE )
+    
+    block_sizes_to_times = { block_size : [] for block_size in block_sizes }
+    
+    # interleaved, so a blip from another process hits one run of every size rather than every run of one
+    for i in range( 3 ):
+        
+        for block_size in block_sizes:
+            
+            start_time = HydrusData.GetNowPrecise()
+            
+            GetHashesFromBuffer( scratch, ( 'sha256', ), block_size = block_size )
+            
+            block_sizes_to_times[ block_size ].append( HydrusData.GetNowPrecise() - start_time )
+            
+        
+    
+    block_sizes_to_best_times = { block_size : min( times ) for ( block_size, times ) in block_sizes_to_times.items() }
+    
+    best_block_size = min( block_sizes, key = lambda block_size: block_sizes_to_best_times[ block_size ] )
+    
+    # the differences are usually small, so unless something is clearly better we stick with the default rather than go with noise
+    
+    if block_sizes_to_best_times[ best_block_size ] > block_sizes_to_best_times[ HC.HASH_READ_BLOCK_SIZE ] * 0.9:
+        
+        best_block_size = HC.HASH_READ_BLOCK_SIZE
+        
+    
+    return best_block_size
+    
 def GenerateThumbnailBytes( path, target_resolution, mime, duration, num_frames, percentage_in = 35 ):
     
     if target_resolution == ( 0, 0 ):
@@ -163,27 +212,11 @@ def GenerateThumbnailBytes( path, target_resolution, mime, duration, num_frames,
     
 def GetExtraHashesFromPath( path ):
     
-    h_md5 = hashlib.md5()
-    h_sha1 = hashlib.sha1()
-    h_sha512 = hashlib.sha512()
-    
-    with open( path, 'rb' ) as f:
-        
-        for block in HydrusPaths.ReadFileLikeAsBlocks( f ):
-            
-            h_md5.update( block )
-            h_sha1.update( block )
-            h_sha512.update( block )
-            
-        
-    
-    md5 = h_md5.digest()
-    sha1 = h_sha1.digest()
-    sha512 = h_sha512.digest()
+    ( md5, sha1, sha512 ) = GetHashesFromPath( path, ( 'md5', 'sha1', 'sha512' ) )
     
     return ( md5, sha1, sha512 )
     
-def GetFileInfo( path, mime = None, ok_to_look_for_hydrus_updates = False ):
+def GetFileInfo( path, mime = None, ok_to_look_for_hydrus_updates = False, header_bytes = None ):
     
     size = os.path.getsize( path )
     
@@ -194,7 +227,7 @@ def GetFileInfo( path, mime = None, ok_to_look_for_hydrus_updates = False ):
     
     if mime is None:
         
-        mime = GetMime( path, ok_to_look_for_hydrus_updates = ok_to_look_for_hydrus_updates )
+        mime = GetMime( path, ok_to_look_for_hydrus_updates = ok_to_look_for_hydrus_updates, header_bytes = header_bytes )
         
     
     if mime not in HC.ALLOWED_MIMES:
@@ -300,21 +333,100 @@ def GetFileModifiedTimestamp( path ):
     
     return file_modified_timestamp
     
+def GetHashBlockSize():
+    
+    return HASH_BLOCK_SIZE
+    
 def GetHashFromPath( path ):
     
-    h = hashlib.sha256()
+    ( sha256, ) = GetHashesFromPath( path, ( 'sha256', ) )
+    
+    return sha256
+    
+def GetHashesFromBuffer( buffer, hash_types, block_size = None ):
+    
+    if block_size is None:
+        
+        block_size = GetHashBlockSize()
+        
+    
+    hashers = [ hashlib.new( hash_type ) for hash_type in hash_types ]
+    
+    # we still go in blocks, so each block is hot in cache for every hasher. slicing a memoryview does not copy
+    for i in range( 0, len( buffer ), block_size ):
+        
+        block = buffer[ i : i + block_size ]
+        
+        for hasher in hashers:
+            
+            hasher.update( block )
+            
+        
+    
+    return tuple( ( hasher.digest() for hasher in hashers ) )
     
-    with open( path, 'rb' ) as f:
+def GetHashesFromFileLike( f, hash_types ):
+    
+    hashers = [ hashlib.new( hash_type ) for hash_type in hash_types ]
+    
+    for block in HydrusPaths.ReadFileLikeAsBlocks( f, block_size = GetHashBlockSize() ):
         
-        for block in HydrusPaths.ReadFileLikeAsBlocks( f ):
+        for hasher in hashers:
             
-            h.update( block )
+            hasher.update( block )
             
         
     
-    return h.digest()
+    return tuple( ( hasher.digest() for hasher in hashers ) )
+    
+def GetHashesAndHeaderFromPath( path, hash_types ):
     
-def GetMime( path, ok_to_look_for_hydrus_updates = False ):
+    # one read of the file feeds every hasher, so asking for several hashes costs no more disk than asking for one
+    # we also hand back the file header, so GetMime does not have to open the file again
+    
+    # unbuffered, so the big blocks go straight from the OS into our buffer and then on to hashlib's C update
+    with open( path, 'rb', buffering = 0 ) as f:
+        
+        HydrusPaths.HintSequentialRead( f )
+        
+        header_bytes = f.read( MIME_HEADER_SIZE )
+        
+        f.seek( 0 )
+        
+        size = os.fstat( f.fileno() ).st_size
+        
+        if size > HC.HASH_MMAP_SIZE_THRESHOLD:
+            
+            # for big files, map them and let hashlib read straight from the page cache without copying every block into a new bytes
+            
+            try:
+                
+                with mmap.mmap( f.fileno(), 0, access = mmap.ACCESS_READ ) as m:
+                    
+                    with memoryview( m ) as view:
+                        
+                        return ( GetHashesFromBuffer( view, hash_types ), header_bytes )
+                        
+                    
+                
+            except ( OSError, ValueError ):
+                
+                # some filesystems will not map, so fall back to normal reading
+                
+                pass
+                
+            
+        
+        return ( GetHashesFromFileLike( f, hash_types ), header_bytes )
+        
+    
+def GetHashesFromPath( path, hash_types ):
+    
+    ( hashes, header_bytes ) = GetHashesAndHeaderFromPath( path, hash_types )
+    
+    return hashes
+    
+def GetMime( path, ok_to_look_for_hydrus_updates = False, header_bytes = None ):
     
     size = os.path.getsize( path )
     
@@ -323,9 +435,16 @@ def GetMime( path, ok_to_look_for_hydrus_updates = False ):
         raise HydrusExceptions.FileSizeException( 'File is of zero length!' )
         
     
-    with open( path, 'rb' ) as f:
+    if header_bytes is None:
         
-        bit_to_check = f.read( 256 )
+        with open( path, 'rb' ) as f:
+            
+            bit_to_check = f.read( MIME_HEADER_SIZE )
+            
+        
+    else:
+        
+        bit_to_check = header_bytes[ : MIME_HEADER_SIZE ]
         
     
     for ( offsets_and_headers, mime ) in headers_and_mime:
@@ -413,6 +532,12 @@ def GetMime( path, ok_to_look_for_hydrus_updates = False ):
     
     return HC.APPLICATION_UNKNOWN
     
+def InitialiseHashBlockSize():
+    
+    global HASH_BLOCK_SIZE
+    
+    HASH_BLOCK_SIZE = BenchmarkHashBlockSize()
+    
 def IsPNGAnimated( file_header_bytes ):
     
     apng_actl_bytes = HydrusVideoHandling.GetAPNGACTLChunk( file_header_bytes )
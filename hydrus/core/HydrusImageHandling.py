@@ -104,14 +104,19 @@ except:
     
     OPENCV_OK = False
     
-def ConvertToPNGIfBMP( path ):
+def ConvertToPNGIfBMP( path, header_bytes = None ) -> bool:
     
-    with open( path, 'rb' ) as f:
+    # returns whether the file was rewritten
+    
+    if header_bytes is None:
         
-        header = f.read( 2 )
+        with open( path, 'rb' ) as f:
+            
+            header_bytes = f.read( 2 )
+            
         
     
-    if header == b'BM':
+    if header_bytes[ : 2 ] == b'BM':
         
         ( os_file_handle, temp_path ) = HydrusTemp.GetTempPath()
         
@@ -134,6 +139,10 @@ def ConvertToPNGIfBMP( path ):
             HydrusTemp.CleanUpTempPath( os_file_handle, temp_path )
             
         
+        return True
+        
+    
+    return False
     
 def Dequantize( pil_image ):
     
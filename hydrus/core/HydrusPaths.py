@@ -304,6 +304,22 @@ def GetFreeSpace( path ):
     
     return disk_usage.free
     
+def HintSequentialRead( f ):
+    
+    # tell the OS we are going to read this front to back, so it can read ahead aggressively
+    
+    if hasattr( os, 'posix_fadvise' ):
+        
+        try:
+            
+            os.posix_fadvise( f.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL )
+            
+        except OSError:
+            
+            pass
+            
+        
+    
 def LaunchDirectory( path ):
     
     def do_it():
@@ -766,15 +782,15 @@ def PathIsFree( path ):
     
     return False
     
-def ReadFileLikeAsBlocks( f ):
+def ReadFileLikeAsBlocks( f, block_size = HC.READ_BLOCK_SIZE ):
     
-    next_block = f.read( HC.READ_BLOCK_SIZE )
+    next_block = f.read( block_size )
     
     while len( next_block ) > 0:
         
         yield next_block
         
-        next_block = f.read( HC.READ_BLOCK_SIZE )
+        next_block = f.read( block_size )
         
     
 def RecyclePath( path ):
@@ -616,9 +616,7 @@ class TestClientAPI( unittest.TestCase ):
         
         hash = bytes.fromhex( 'a593942cb7ea9ffcd8ccf2f0fa23c338e23bfecd9a3e508dfc0bcf07501ead08' )
         
-        f = ClientImportFiles.FileImportStatus.STATICGetUnknownStatus()
-        
-        f.hash = hash
+        f = ClientImportFiles.FileImportStatus( CC.STATUS_UNKNOWN, hash )
         
         HG.test_controller.SetRead( 'hash_status', f )
         
@@ -648,10 +646,7 @@ class TestClientAPI( unittest.TestCase ):
         
         hash = b'\xadm5\x99\xa6\xc4\x89\xa5u\xeb\x19\xc0&\xfa\xce\x97\xa9\xcdey\xe7G(\xb0\xce\x94\xa6\x01\xd22\xf3\xc3'
         
-        f = ClientImportFiles.FileImportStatus.STATICGetUnknownStatus()
-        
-        f.hash = hash
-        f.note = 'test note'
+        f = ClientImportFiles.FileImportStatus( CC.STATUS_UNKNOWN, hash, note = 'test note' )
         
         HG.test_controller.SetRead( 'hash_status', f )
         
@@ -686,10 +681,7 @@ class TestClientAPI( unittest.TestCase ):
         
         # do hydrus png as path
         
-        f = ClientImportFiles.FileImportStatus.STATICGetUnknownStatus()
-        
-        f.hash = hash
-        f.note = 'test note'
+        f = ClientImportFiles.FileImportStatus( CC.STATUS_UNKNOWN, hash, note = 'test note' )
         
         HG.test_controller.SetRead( 'hash_status', f )
         
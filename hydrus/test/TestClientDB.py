@@ -1380,6 +1380,17 @@ class TestClientDB( unittest.TestCase ):
             self.assertIn( 'already in the db', written_note )
             
         
+        # the job above put an 'unknown' status in the import hash status cache, so the import must have cleared it
+        
+        file_import_job = ClientImportFiles.FileImportJob( path, file_import_options )
+        
+        file_import_job.GeneratePreImportHashAndStatus()
+        
+        file_import_status = file_import_job.GetPreImportStatus()
+        
+        self.assertIn( file_import_status.status, ( CC.STATUS_UNKNOWN, CC.STATUS_SUCCESSFUL_BUT_REDUNDANT ) )
+        self.assertNotEqual( file_import_status.note, '' )
+        
         #
         
         content_update = HydrusData.ContentUpdate( HC.CONTENT_TYPE_FILES, HC.CONTENT_UPDATE_DELETE, ( hash, ), reason = 'test delete' )
@@ -1399,6 +1410,14 @@ class TestClientDB( unittest.TestCase ):
         self.assertEqual( written_status, CC.STATUS_DELETED )
         self.assertEqual( written_hash, hash )
         
+        # and the delete must have cleared it
+        
+        file_import_job = ClientImportFiles.FileImportJob( path, file_import_options )
+        
+        file_import_job.GeneratePreImportHashAndStatus()
+        
+        self.assertEqual( file_import_job.GetPreImportStatus().status, CC.STATUS_DELETED )
+        
         # now physical delete
         
         TestClientDB._clear_db()
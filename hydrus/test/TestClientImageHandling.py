@@ -22,3 +22,38 @@ class TestImageHandling( unittest.TestCase ):
         
         self.assertEqual( phashes, set( [ b'\xb4M\xc7\xb2M\xcb8\x1c' ] ) )
         
+        #
+        
+        paths_and_mimes = [
+            ( os.path.join( HC.STATIC_DIR, 'hydrus.png' ), HC.IMAGE_PNG ),
+            ( os.path.join( HC.STATIC_DIR, 'boned.jpg' ), HC.IMAGE_JPEG ),
+            ( os.path.join( HC.STATIC_DIR, 'lain.jpg' ), HC.IMAGE_JPEG ),
+            ( os.path.join( HC.STATIC_DIR, 'hydrus_splash.png' ), HC.IMAGE_PNG )
+        ]
+        
+        numba_ok = ClientImageHandling.InitialiseNumba()
+        
+        try:
+            
+            ClientImageHandling.NUMBA_OK = False
+            
+            numpy_list_of_phashes = [ ClientImageHandling.GenerateShapePerceptualHashes( path, mime ) for ( path, mime ) in paths_and_mimes ]
+            
+        finally:
+            
+            ClientImageHandling.NUMBA_OK = numba_ok
+            
+        
+        self.assertEqual( numpy_list_of_phashes[0], set( [ b'\xb4M\xc7\xb2M\xcb8\x1c' ] ) )
+        
+        self.assertGreater( len( { frozenset( phashes ) for phashes in numpy_list_of_phashes } ), 1 )
+        
+        if numba_ok:
+            
+            self.assertIsNotNone( ClientImageHandling.GetThresholdAndPackPerceptualHashNumba() )
+            
+            numba_list_of_phashes = [ ClientImageHandling.GenerateShapePerceptualHashes( path, mime ) for ( path, mime ) in paths_and_mimes ]
+            
+            self.assertEqual( numba_list_of_phashes, numpy_list_of_phashes )
+            
+    
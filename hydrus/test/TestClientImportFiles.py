@@ -0,0 +1,146 @@
+import os
+import time
+import unittest
+
+from hydrus.core import HydrusConstants as HC
+from hydrus.core import HydrusData
+from hydrus.core import HydrusGlobals as HG
+
+from hydrus.client import ClientConstants as CC
+from hydrus.client.importing import ClientImportFiles
+
+class TestFileImportHashStatusCache( unittest.TestCase ):
+    
+    def test_cache( self ):
+        
+        cache = ClientImportFiles.FileImportHashStatusCache()
+        
+        hash = os.urandom( 32 )
+        
+        unknown_status = ClientImportFiles.FileImportStatus( CC.STATUS_UNKNOWN, hash )
+        redundant_status = ClientImportFiles.FileImportStatus( CC.STATUS_SUCCESSFUL_BUT_REDUNDANT, hash, mime = HC.IMAGE_PNG, note = 'file recognised: Imported at 2021, which was 1 second before this check.' )
+        
+        HG.test_controller.SetRead( 'hash_status', unknown_status )
+        
+        self.assertIs( cache.GetHashStatus( hash ), unknown_status )
+        
+        HG.test_controller.SetRead( 'hash_status', redundant_status )
+        
+        self.assertIs( cache.GetHashStatus( hash ), unknown_status )
+        
+        # a files update for the hash clears it
+        
+        content_update = HydrusData.ContentUpdate( HC.CONTENT_TYPE_FILES, HC.CONTENT_UPDATE_DELETE, ( hash, ) )
+        
+        cache.ProcessContentUpdates( { CC.LOCAL_FILE_SERVICE_KEY : [ content_update ] } )
+        
+        self.assertIs( cache.GetHashStatus( hash ), redundant_status )
+        
+        # statuses with a note are not kept, since the note's 'N before this check' would go stale
+        
+        newer_redundant_status = ClientImportFiles.FileImportStatus( CC.STATUS_SUCCESSFUL_BUT_REDUNDANT, hash, mime = HC.IMAGE_PNG, note = 'file recognised: Imported at 2021, which was 5 minutes before this check.' )
+        
+        HG.test_controller.SetRead( 'hash_status', newer_redundant_status )
+        
+        self.assertIs( cache.GetHashStatus( hash ), newer_redundant_status )
+        
+    
+class TestFileImportArchiveBatcher( unittest.TestCase ):
+    
+    def _GetArchivedHashes( self ):
+        
+        writes = HG.test_controller.GetWrite( 'content_updates' )
+        
+        self.assertEqual( len( writes ), 1 )
+        
+        [ ( ( service_keys_to_content_updates, ), kwargs ) ] = writes
+        
+        self.assertEqual( list( service_keys_to_content_updates.keys() ), [ CC.COMBINED_LOCAL_FILE_SERVICE_KEY ] )
+        
+        [ content_update ] = service_keys_to_content_updates[ CC.COMBINED_LOCAL_FILE_SERVICE_KEY ]
+        
+        self.assertEqual( content_update.GetDataType(), HC.CONTENT_TYPE_FILES )
+        self.assertEqual( content_update.GetAction(), HC.CONTENT_UPDATE_ARCHIVE )
+        
+        return set( content_update.GetHashes() )
+        
+    
+    def test_size_flush( self ):
+        
+        HG.test_controller.ClearWrites( 'content_updates' )
+        
+        batcher = ClientImportFiles.FileImportArchiveBatcher( flush_size = 3, flush_delay = 60 )
+        
+        hashes = [ os.urandom( 32 ) for i in range( 3 ) ]
+        
+        batcher.AddHash( hashes[0] )
+        batcher.AddHash( hashes[1] )
+        
+        self.assertEqual( HG.test_controller.GetWrite( 'content_updates' ), [] )
+        
+        flush_job = batcher._flush_job
+        
+        self.assertIsNotNone( flush_job )
+        
+        batcher.AddHash( hashes[2] )
+        
+        self.assertEqual( self._GetArchivedHashes(), set( hashes ) )
+        
+        # the timer from the first hash must not go off later and send the next batch half-full
+        
+        self.assertTrue( flush_job.IsCancelled() )
+        self.assertIsNone( batcher._flush_job )
+        
+    
+    def test_timer_flush( self ):
+        
+        HG.test_controller.ClearWrites( 'content_updates' )
+        
+        batcher = ClientImportFiles.FileImportArchiveBatcher( flush_size = 3, flush_delay = 0.25 )
+        
+        hashes = [ os.urandom( 32 ) for i in range( 2 ) ]
+        
+        for hash in hashes:
+            
+            batcher.AddHash( hash )
+            
+        
+        self.assertEqual( HG.test_controller.GetWrite( 'content_updates' ), [] )
+        
+        flush_job = batcher._flush_job
+        
+        started = time.time()
+        
+        while not flush_job.IsWorkComplete() and time.time() < started + 10:
+            
+            time.sleep( 0.05 )
+            
+        
+        self.assertEqual( self._GetArchivedHashes(), set( hashes ) )
+        
+        self.assertIsNone( batcher._flush_job )
+        
+    
+    def test_explicit_flush( self ):
+        
+        HG.test_controller.ClearWrites( 'content_updates' )
+        
+        batcher = ClientImportFiles.FileImportArchiveBatcher( flush_size = 3, flush_delay = 60 )
+        
+        hash = os.urandom( 32 )
+        
+        batcher.AddHash( hash )
+        
+        flush_job = batcher._flush_job
+        
+        batcher.Flush()
+        
+        self.assertEqual( self._GetArchivedHashes(), { hash } )
+        
+        self.assertTrue( flush_job.IsCancelled() )
+        
+        batcher.Flush()
+        
+        self.assertEqual( HG.test_controller.GetWrite( 'content_updates' ), [] )
+        
+    
@@ -236,6 +236,8 @@ class TestFileImportOptions( unittest.TestCase ):
         
         #
         
+        self.assertIs( file_import_options.GetPreImportOptions(), file_import_options.Duplicate().GetPreImportOptions() )
+        
         self.assertFalse( file_import_options.ExcludesDeleted() )
         self.assertFalse( file_import_options.AllowsDecompressionBombs() )
         self.assertFalse( file_import_options.AutomaticallyArchives() )
@@ -272,6 +274,8 @@ class TestFileImportOptions( unittest.TestCase ):
         self.assertTrue( file_import_options.AllowsDecompressionBombs() )
         self.assertFalse( file_import_options.AutomaticallyArchives() )
         
+        self.assertNotIn( 'automatically archiving', file_import_options.GetSummary() )
+        
         #
         
         automatic_archive = True
@@ -286,6 +290,8 @@ class TestFileImportOptions( unittest.TestCase ):
         self.assertTrue( file_import_options.ShouldAssociatePrimaryURLs() )
         self.assertTrue( file_import_options.ShouldAssociateSourceURLs() )
         
+        self.assertIn( 'automatically archiving', file_import_options.GetSummary() )
+        
         #
         
         min_size = 4096
@@ -313,6 +319,20 @@ class TestFileImportOptions( unittest.TestCase ):
             file_import_options.CheckFileIsValid( 2200, HC.IMAGE_JPEG, 640, 480 )
             
         
+        # the remembered summary follows the human bytes option
+        
+        new_options = HG.client_controller.new_options
+        
+        human_bytes_sig_figs = new_options.GetInteger( 'human_bytes_sig_figs' )
+        
+        self.assertIn( HydrusData.ToHumanBytes( max_size ), file_import_options.GetSummary() )
+        
+        new_options.SetInteger( 'human_bytes_sig_figs', 1 )
+        
+        self.assertIn( HydrusData.ToHumanBytes( max_size ), file_import_options.GetSummary() )
+        
+        new_options.SetInteger( 'human_bytes_sig_figs', human_bytes_sig_figs )
+        
         #
         
         max_size = None
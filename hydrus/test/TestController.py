@@ -49,6 +49,7 @@ from hydrus.test import TestClientDB
 from hydrus.test import TestClientDBDuplicates
 from hydrus.test import TestClientDBTags
 from hydrus.test import TestClientImageHandling
+from hydrus.test import TestClientImportFiles
 from hydrus.test import TestClientImportOptions
 from hydrus.test import TestClientImportSubscriptions
 from hydrus.test import TestClientListBoxes
@@ -60,6 +61,7 @@ from hydrus.test import TestClientThreading
 from hydrus.test import TestDialogs
 from hydrus.test import TestFunctions
 from hydrus.test import TestHydrusData
+from hydrus.test import TestHydrusFileHandling
 from hydrus.test import TestHydrusNATPunch
 from hydrus.test import TestHydrusNetworking
 from hydrus.test import TestHydrusSerialisable
@@ -759,6 +761,7 @@ class Controller( object ):
             TestClientDaemons,
             TestClientConstants,
             TestClientData,
+            TestClientImportFiles,
             TestClientImportOptions,
             TestClientParsing,
             TestClientTags,
@@ -771,6 +774,7 @@ class Controller( object ):
             TestClientDBDuplicates,
             TestClientDBTags,
             TestHydrusData,
+            TestHydrusFileHandling,
             TestHydrusNATPunch,
             TestClientNetworking,
             TestHydrusNetworking,
@@ -796,12 +800,14 @@ class Controller( object ):
         module_lookup[ 'data' ] = [
             TestClientConstants,
             TestClientData,
+            TestClientImportFiles,
             TestClientImportOptions,
             TestClientParsing,
             TestClientTags,
             TestClientThreading,
             TestFunctions,
             TestHydrusData,
+            TestHydrusFileHandling,
             TestHydrusSerialisable,
             TestHydrusSessions
         ]
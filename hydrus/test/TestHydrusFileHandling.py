@@ -0,0 +1,68 @@
+import hashlib
+import os
+import unittest
+
+from hydrus.core import HydrusConstants as HC
+from hydrus.core import HydrusFileHandling
+from hydrus.core import HydrusTemp
+
+class TestHydrusFileHandling( unittest.TestCase ):
+    
+    def _TestHashesAndHeader( self, data ):
+        
+        hash_types = ( 'sha256', 'md5', 'sha1', 'sha512' )
+        
+        expected_hashes = tuple( ( hashlib.new( hash_type, data ).digest() for hash_type in hash_types ) )
+        
+        ( os_file_handle, temp_path ) = HydrusTemp.GetTempPath()
+        
+        try:
+            
+            with open( temp_path, 'wb' ) as f:
+                
+                f.write( data )
+                
+            
+            ( hashes, header_bytes ) = HydrusFileHandling.GetHashesAndHeaderFromPath( temp_path, hash_types )
+            
+            self.assertEqual( hashes, expected_hashes )
+            self.assertEqual( header_bytes, data[ : HydrusFileHandling.MIME_HEADER_SIZE ] )
+            
+            ( sha256, ) = HydrusFileHandling.GetHashesFromPath( temp_path, ( 'sha256', ) )
+            
+            self.assertEqual( sha256, hashlib.sha256( data ).digest() )
+            
+        finally:
+            
+            HydrusTemp.CleanUpTempPath( os_file_handle, temp_path )
+            
+        
+    
+    def test_hash_block_size( self ):
+        
+        self.assertEqual( HydrusFileHandling.GetHashBlockSize(), HC.HASH_READ_BLOCK_SIZE )
+        
+        block_size = HydrusFileHandling.BenchmarkHashBlockSize()
+        
+        self.assertIn( block_size, ( 64 * 1024, 256 * 1024, 1024 * 1024, 4 * 1024 * 1024 ) )
+        
+    
+    def test_hashes_and_header_empty( self ):
+        
+        self._TestHashesAndHeader( b'' )
+        
+    
+    def test_hashes_and_header_tiny( self ):
+        
+        self._TestHashesAndHeader( b'hello' )
+        
+    
+    def test_hashes_and_header_mmap( self ):
+        
+        # just over the threshold, so this goes through the mmap path, and not a multiple of any block size
+        
+        data = os.urandom( HC.HASH_MMAP_SIZE_THRESHOLD + 12345 )
+        
+        self._TestHashesAndHeader( data )
+        
+    